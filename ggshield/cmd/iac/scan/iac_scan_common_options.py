@@ -24,7 +24,7 @@ from ggshield.cmd.utils.common_options import (
 from ggshield.cmd.utils.context_obj import ContextObj
 from ggshield.core.client import create_client_from_config
 from ggshield.core.config.user_config import (
-    POLICY_ID_PATTERN,
+    POLICY_ID_FORMAT,
     IaCConfigIgnoredPath,
     IaCConfigIgnoredPolicy,
     validate_policy_id,
@@ -38,7 +38,7 @@ def _validate_exclude(_ctx: Any, _param: Any, value: Sequence[str]) -> Sequence[
     ]
     if len(invalid_excluded_policies) > 0:
         raise ValueError(
-            f"The policies {invalid_excluded_policies} do not match the pattern '{POLICY_ID_PATTERN.pattern}'"
+            f"The policies {invalid_excluded_policies} do not match the pattern '{POLICY_ID_FORMAT}'"
         )
     return value
 
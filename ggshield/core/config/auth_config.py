@@ -71,8 +71,7 @@ def prepare_auth_config_dict_for_parse(data: Dict[str, Any]) -> Dict[str, Any]:
 
     We replace `-` with `_` for compatibility reasons.
     """
-    replace_in_keys(data, "-", "_")
-    data = deepcopy(data)
+    data = replace_in_keys(data, "-", "_")
     try:
         instances = data["instances"]
     except KeyError:
@@ -137,6 +137,9 @@ class Config:
     def add_ignored_match(self, *args: Any, **kwargs: Any) -> None:
         return self.user_config.secret.add_ignored_match(*args, **kwargs)
 
+    def add_ignored_matches(self, *args: Any, **kwargs: Any) -> None:
+        return self.user_config.secret.add_ignored_matches(*args, **kwargs)
+
     @property
     def saas_api_url(self) -> str:
         """
@@ -1,19 +1,23 @@
 import logging
-import re
+import sys
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import marshmallow_dataclass
 from marshmallow import ValidationError, post_load, pre_load
 from pygitguardian.models import FromDictMixin
 
 from ggshield.core.config.utils import (
+    clear_config_path_cache,
     find_global_config_path,
     find_local_config_path,
+    lazy_schema,
     load_yaml_dict,
-    remove_common_dict_items,
+    remove_common_dict_items_and_replace_in_keys,
     replace_in_keys,
     save_yaml_dict,
     update_from_other_instance,
@@ -30,8 +34,34 @@ CURRENT_CONFIG_VERSION = 2
 
 _IGNORE_KNOWN_SECRETS_KEY = "ignore-known-secrets"
 
-GHSA_ID_PATTERN = re.compile("GHSA(-[a-zA-Z0-9]{4}){3}")
-POLICY_ID_PATTERN = re.compile("GG_IAC_[0-9]{4}")
+# Identifiers have a fixed length, so they are validated with plain string checks,
+# which are much cheaper than running a regular expression.
+_GHSA_ID_PREFIX = "GHSA"
+_GHSA_ID_GROUP_COUNT = 3
+_GHSA_ID_GROUP_LENGTH = 4
+_GHSA_ID_LENGTH = len(_GHSA_ID_PREFIX) + _GHSA_ID_GROUP_COUNT * (
+    1 + _GHSA_ID_GROUP_LENGTH
+)
+
+_POLICY_ID_PREFIX = "GG_IAC_"
+_POLICY_ID_DIGIT_COUNT = 4
+_POLICY_ID_LENGTH = len(_POLICY_ID_PREFIX) + _POLICY_ID_DIGIT_COUNT
+
+# Human-readable descriptions of the expected identifier formats, used in error
+# messages. These are not used for validation.
+GHSA_ID_FORMAT = (
+    f"{_GHSA_ID_PREFIX}"
+    f"(-[a-zA-Z0-9]{{{_GHSA_ID_GROUP_LENGTH}}}){{{_GHSA_ID_GROUP_COUNT}}}"
+)
+POLICY_ID_FORMAT = f"{_POLICY_ID_PREFIX}[0-9]{{{_POLICY_ID_DIGIT_COUNT}}}"
+
+
+def _intern_detectors(detectors: Iterable[str]) -> Set[str]:
+    """
+    Detector names come from a small set: intern them so that all the configurations
+    loaded by the process share the same string objects.
+    """
+    return {sys.intern(detector) for detector in detectors}
 
 
 @marshmallow_dataclass.dataclass
@@ -46,21 +76,47 @@ class SecretConfig(FilteredConfig):
     ignored_paths: Set[str] = field(default_factory=set)
     ignore_known_secrets: bool = False
 
+    @post_load
+    def intern_ignored_detectors(self, data: Dict[str, Any], **kwargs: Any):
+        data["ignored_detectors"] = _intern_detectors(data["ignored_detectors"])
+        return data
+
     def add_ignored_match(self, secret: IgnoredMatch) -> None:
         """
         Add secret to ignored_matches.
         """
+        self.add_ignored_matches([secret])
+
+    def add_ignored_matches(self, secrets: Iterable[IgnoredMatch]) -> None:
+        """
+        Add secrets to ignored_matches.
+
+        Existing matches are indexed once, so adding many secrets does not require
+        scanning ignored_matches for each of them.
+        """
+        matches_by_hash: Dict[str, IgnoredMatch] = {}
         for match in self.ignored_matches:
-            if match.match == secret.match:
+            matches_by_hash.setdefault(match.match, match)
+
+        for secret in secrets:
+            match = matches_by_hash.get(secret.match)
+            if match is None:
+                self.ignored_matches.append(secret)
+                matches_by_hash[secret.match] = secret
+            elif not match.name:
                 # take the opportunity to name the ignored match
-                if not match.name:
-                    match.name = secret.name
-                return
-        self.ignored_matches.append(secret)
+                match.name = secret.name
 
 
 def validate_policy_id(policy_id: str) -> bool:
-    return bool(POLICY_ID_PATTERN.fullmatch(policy_id))
+    """Returns True if `policy_id` matches POLICY_ID_FORMAT"""
+    digits = policy_id[len(_POLICY_ID_PREFIX) :]
+    return (
+        len(policy_id) == _POLICY_ID_LENGTH
+        and policy_id.startswith(_POLICY_ID_PREFIX)
+        and digits.isascii()
+        and digits.isdigit()
+    )
 
 
 @marshmallow_dataclass.dataclass
@@ -78,11 +134,25 @@ class ConfigIgnoredElement(FilteredConfig):
     def parse_date(self, data: Dict[str, Any], **kwargs: Any):
         if not (isinstance(data, dict)) or data.get("until") is None:
             return data
-        try:
-            data["until"] = str(datetime.strptime(str(data["until"]), "%Y-%m-%d"))
-            return data
-        except ValueError:
+        until = data["until"]
+        if isinstance(until, datetime):
             return data
+        if not isinstance(until, date):
+            # The YAML loader already turns unquoted dates into date instances, so
+            # this is only needed for other inputs. Use date.fromisoformat() for
+            # strings in the canonical yyyy-mm-dd format since it is much faster than
+            # strptime(), but only for this format, because it accepts other ISO 8601
+            # formats on recent Python versions.
+            until = str(until)
+            try:
+                if len(until) == 10 and until[4] == until[7] == "-":
+                    until = date.fromisoformat(until)
+                else:
+                    until = datetime.strptime(until, "%Y-%m-%d")
+            except ValueError:
+                return data
+        data["until"] = str(datetime(until.year, until.month, until.day))
+        return data
 
     @post_load
     def datetime_to_utc(self, data: Dict[str, Any], **kwargs: Any):
@@ -91,17 +161,33 @@ class ConfigIgnoredElement(FilteredConfig):
         return data
 
 
+# Set while loading a configuration file, so that all the post_load hooks calling
+# remove_expired_elements() compare `until` dates to the same time
+_expiration_reference_time: ContextVar[Optional[datetime]] = ContextVar(
+    "expiration_reference_time", default=None
+)
+
+
 def remove_expired_elements(
-    lst: List[ConfigIgnoredElement],
+    lst: List[ConfigIgnoredElement], now: Optional[datetime] = None
 ) -> List[ConfigIgnoredElement]:
+    """
+    Removes elements whose `until` date has passed from `lst`, and returns them.
+
+    If `now` is not set, the reference time of the configuration file being loaded is
+    used, or the current time if no file is being loaded.
+    """
+    if now is None:
+        now = _expiration_reference_time.get() or datetime.now(tz=timezone.utc)
+    kept: List[ConfigIgnoredElement] = []
     expired: List[ConfigIgnoredElement] = []
-    now = datetime.now(tz=timezone.utc)
-    for idx in range(len(lst) - 1, -1, -1):
-        ignored = lst[idx]
+    for ignored in lst:
         if ignored.until and ignored.until <= now:
-            lst.pop(idx)
-            expired.insert(0, ignored)
+            expired.append(ignored)
+        else:
+            kept.append(ignored)
 
+    lst[:] = kept
     return expired
 
 
@@ -197,13 +283,23 @@ class IaCConfig(FilteredConfig):
 
 
 def is_ghsa_valid(ghsa_id: str) -> bool:
-    return bool(GHSA_ID_PATTERN.fullmatch(ghsa_id))
+    """Returns True if `ghsa_id` matches GHSA_ID_FORMAT"""
+    if len(ghsa_id) != _GHSA_ID_LENGTH or not ghsa_id.isascii():
+        return False
+    prefix, *groups = ghsa_id.split("-")
+    return (
+        prefix == _GHSA_ID_PREFIX
+        and len(groups) == _GHSA_ID_GROUP_COUNT
+        and all(
+            len(group) == _GHSA_ID_GROUP_LENGTH and group.isalnum() for group in groups
+        )
+    )
 
 
 def validate_vuln_identifier(value: str):
     if not is_ghsa_valid(value):
         raise ValidationError(
-            f"The given GHSA id '{value}' do not match the pattern '{GHSA_ID_PATTERN.pattern}'"
+            f"The given GHSA id '{value}' do not match the pattern '{GHSA_ID_FORMAT}'"
         )
 
 
@@ -289,15 +385,13 @@ class UserConfig(FilteredConfig):
         """
         Save config to config_path
         """
-        dct = self.to_dict()
-        default_dct = UserConfig.from_dict({}).to_dict()
-
-        dct = remove_common_dict_items(dct, default_dct)
-
+        dct = remove_common_dict_items_and_replace_in_keys(
+            self.to_dict(), _get_default_config_dict(), old_char="_", new_char="-"
+        )
         dct["version"] = CURRENT_CONFIG_VERSION
-
-        replace_in_keys(dct, old_char="_", new_char="-")
         save_yaml_dict(dct, config_path)
+        # config_path may be a new config file
+        clear_config_path_cache()
 
     @classmethod
     def load(cls, config_path: Optional[Path] = None) -> Tuple["UserConfig", Path]:
@@ -338,10 +432,18 @@ class UserConfig(FilteredConfig):
             data = load_yaml_dict(config_path) or {"version": CURRENT_CONFIG_VERSION}
             config_version = data.pop("version", 1)
             if config_version == 2:
+                # No need to walk the whole dict with replace_in_keys() here: v2
+                # configs use '-' in keys, and FilteredConfig.filter_fields() turns
+                # them into '_' as each mapping gets loaded
                 _fix_ignore_known_secrets(data)
-                obj = UserConfig.from_dict(data)
+                token = _expiration_reference_time.set(datetime.now(tz=timezone.utc))
+                try:
+                    obj = UserConfig.from_dict(data)
+                finally:
+                    _expiration_reference_time.reset(token)
             elif config_version == 1:
-                replace_in_keys(data, old_char="-", new_char="_")
+                # UserV1Config is not a FilteredConfig, so keys must be fixed first
+                data = replace_in_keys(data, old_char="-", new_char="_")
                 self.deprecation_messages.append(
                     f"{config_path} uses a deprecated configuration file format."
                     " Run `ggshield config migrate` to migrate it to the latest version."
@@ -360,7 +462,7 @@ class UserConfig(FilteredConfig):
         update_from_other_instance(self, obj)
 
 
-UserConfig.SCHEMA = marshmallow_dataclass.class_schema(UserConfig)(
+UserConfig.SCHEMA = lazy_schema(
     exclude=(
         "deprecation_messages",
         "iac.outdated_ignored_paths",
@@ -369,6 +471,14 @@ UserConfig.SCHEMA = marshmallow_dataclass.class_schema(UserConfig)(
 )
 
 
+@lru_cache(None)
+def _get_default_config_dict() -> Dict[str, Any]:
+    """Returns the dict representation of a default UserConfig. It never changes, so
+    compute it once instead of doing a full load/dump round-trip on each save.
+    Callers must not modify the returned dict."""
+    return UserConfig.from_dict({}).to_dict()
+
+
 def _fix_ignore_known_secrets(data: Dict[str, Any]) -> None:
     """Fix a mistake done when implementing ignore-known-secrets: since this is a secret
     specific key, it should have been stored in the "secret" mapping, not in the root
@@ -416,11 +526,8 @@ class UserV1Config(FromDictMixin):
         """
         # If data contains the old "api-url" key, turn it into an "instance" key,
         # but only if there is no "instance" key
-        try:
+        if "api_url" in data:
             api_url = data.pop("api_url")
-        except KeyError:
-            pass
-        else:
             if "instance" not in data:
                 data["instance"] = api_to_dashboard_url(api_url, warn=True)
 
@@ -445,7 +552,7 @@ class UserV1Config(FromDictMixin):
         ]
         secret = SecretConfig(
             show_secrets=v1config.show_secrets,
-            ignored_detectors=v1config.banlisted_detectors,
+            ignored_detectors=_intern_detectors(v1config.banlisted_detectors),
             ignored_matches=ignored_matches,
             ignored_paths=v1config.paths_ignore,
         )
@@ -475,4 +582,4 @@ class UserV1Config(FromDictMixin):
                 matches_ignore[idx] = {"name": "", "match": match}
 
 
-UserV1Config.SCHEMA = marshmallow_dataclass.class_schema(UserV1Config)()
+UserV1Config.SCHEMA = lazy_schema()
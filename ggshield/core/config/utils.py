@@ -1,10 +1,13 @@
 from dataclasses import fields, is_dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Union, overload
+from typing import Any, Dict, Literal, Optional, Union, cast, overload
 
+import marshmallow_dataclass
 import yaml
 import yaml.parser
 import yaml.scanner
+from marshmallow import Schema
 
 from ggshield.core.constants import (
     AUTH_CONFIG_FILENAME,
@@ -16,17 +19,33 @@ from ggshield.core.errors import UnexpectedError
 from ggshield.utils.git_shell import GitExecutableNotFound
 
 
-def replace_in_keys(data: Union[List, Dict], old_char: str, new_char: str) -> None:
-    """Replace old_char with new_char in data keys."""
+# Use the libyaml-based loader and dumper when PyYAML has been built with it: they are
+# much faster than the pure-Python implementations
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper, SafeLoader
+
+
+def replace_in_keys(data: Any, old_char: str, new_char: str) -> Any:
+    """
+    Returns a copy of `data` with old_char replaced with new_char in dict keys.
+    Dicts and lists are rebuilt, other values are returned as is.
+    """
     if isinstance(data, dict):
-        for key, value in list(data.items()):
-            replace_in_keys(value, old_char=old_char, new_char=new_char)
-            if old_char in key:
-                new_key = key.replace(old_char, new_char)
-                data[new_key] = data.pop(key)
+        return {
+            key.replace(old_char, new_char): replace_in_keys(
+                value, old_char=old_char, new_char=new_char
+            )
+            for key, value in data.items()
+        }
     elif isinstance(data, list):
-        for element in data:
+        return [
             replace_in_keys(element, old_char=old_char, new_char=new_char)
+            for element in data
+        ]
+    return data
 
 
 def load_yaml_dict(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
@@ -36,7 +55,7 @@ def load_yaml_dict(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
 
     with path.open() as f:
         try:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=SafeLoader) or {}
         except (yaml.parser.ParserError, yaml.scanner.ScannerError) as e:
             message = f"{path} is not a valid YAML file:\n{str(e)}"
             raise ValueError(message)
@@ -52,12 +71,52 @@ def save_yaml_dict(data: Dict[str, Any], path: Union[str, Path]) -> None:
     p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("w") as f:
         try:
-            stream = yaml.dump(data, indent=2, default_flow_style=False)
+            stream = yaml.dump(
+                data, Dumper=SafeDumper, indent=2, default_flow_style=False
+            )
             f.write(stream)
         except Exception as e:
             raise UnexpectedError(f"Failed to save config to {path}:\n{str(e)}") from e
 
 
+class LazySchema:
+    """
+    Descriptor creating the marshmallow schema of a dataclass the first time it is
+    used, instead of when the module defining the dataclass is imported. This keeps
+    schema creation out of the startup time of commands which do not need it.
+
+    Do not instantiate it directly, use `lazy_schema()` instead.
+    """
+
+    def __init__(self, **kwargs: Any):
+        self.kwargs = kwargs
+
+    def __get__(self, instance: Any, owner: type) -> Schema:
+        # class_schema() inspects all the members of `owner`: hide ourself while it
+        # runs to avoid being called recursively
+        setattr(owner, "SCHEMA", None)
+        try:
+            schema = marshmallow_dataclass.class_schema(owner)(**self.kwargs)
+        except BaseException:
+            setattr(owner, "SCHEMA", self)
+            raise
+        # Replace ourself with the schema, so that it is only created once
+        setattr(owner, "SCHEMA", schema)
+        return schema
+
+
+def lazy_schema(**kwargs: Any) -> Schema:
+    """
+    Returns a LazySchema, to be assigned to the `SCHEMA` attribute of a dataclass:
+    `MyDataclass.SCHEMA = lazy_schema(exclude=...)`. Keyword arguments are passed to
+    the schema constructor.
+
+    The LazySchema is typed as the Schema it turns into when accessed, so that it can
+    be assigned to `SCHEMA`, which is declared as a Schema by pygitguardian.
+    """
+    return cast(Schema, LazySchema(**kwargs))
+
+
 def get_auth_config_filepath() -> Path:
     return get_config_dir() / AUTH_CONFIG_FILENAME
 
@@ -86,49 +145,77 @@ def find_global_config_path(*, to_write: bool = False) -> Optional[Path]:
 
     This means the function never returns None if `to_write` is True.
     """
-    for filename in USER_CONFIG_FILENAMES:
-        path = get_global_path(filename)
-        if path.exists():
-            return path
-    return get_global_path(DEFAULT_CONFIG_FILENAME) if to_write else None
+    path = _find_config_path_in_dir(get_user_home_dir())
+    if path is None and to_write:
+        return get_global_path(DEFAULT_CONFIG_FILENAME)
+    return path
 
 
 def find_local_config_path() -> Optional[Path]:
     try:
         project_root_dir = get_project_root_dir(Path())
     except GitExecutableNotFound:
-        project_root_dir = Path()
+        project_root_dir = Path.cwd()
+    return _find_config_path_in_dir(project_root_dir)
+
+
+@lru_cache(None)
+def _find_config_path_in_dir(directory: Path) -> Optional[Path]:
+    """
+    Returns the path to the first user config file found in `directory`, or None.
+
+    The result is cached, since the configuration is loaded several times in some
+    cases. Call clear_config_path_cache() after creating a user config file, so that
+    it is found.
+    """
     for filename in USER_CONFIG_FILENAMES:
-        path = project_root_dir / filename
-        if path.exists():
+        path = directory / filename
+        if path.is_file():
             return path
     return None
 
 
+def clear_config_path_cache() -> None:
+    """
+    Forgets the config file paths found by find_global_config_path() and
+    find_local_config_path().
+    """
+    _find_config_path_in_dir.cache_clear()
+
+
 def update_from_other_instance(dst: Any, src: Any) -> None:
     """
     Update `dst` with fields from `src` if they are set.
     `src` must be the same class or a subclass of `dst`.
     """
-    assert isinstance(src, dst.__class__)
-    for field_ in fields(src):
-        name = field_.name
-        value = src.__dict__[name]
-        if value is None:
-            continue
-        if isinstance(value, list):
-            dst.__dict__[name].extend(value)
-        elif isinstance(value, set):
-            dst.__dict__[name].update(value)
-        elif is_dataclass(value):
-            update_from_other_instance(dst.__dict__[name], value)
-        else:
-            dst.__dict__[name] = value
-
-
-def remove_common_dict_items(dct: Dict, reference_dct: Dict) -> Dict:
+    # Nested dataclasses are handled using a stack rather than through recursion
+    stack = [(dst, src)]
+    while stack:
+        dst, src = stack.pop()
+        assert isinstance(src, dst.__class__)
+        dst_dict = dst.__dict__
+        src_dict = src.__dict__
+        for field_ in fields(src):
+            name = field_.name
+            value = src_dict[name]
+            if value is None:
+                continue
+            if isinstance(value, list):
+                dst_dict[name].extend(value)
+            elif isinstance(value, set):
+                dst_dict[name].update(value)
+            elif is_dataclass(value):
+                stack.append((dst_dict[name], value))
+            else:
+                dst_dict[name] = value
+
+
+def remove_common_dict_items_and_replace_in_keys(
+    dct: Dict, reference_dct: Dict, old_char: str, new_char: str
+) -> Dict:
     """
-    Returns a copy of `dct` with all items already in `reference_dct` removed.
+    Returns a copy of `dct` with all items already in `reference_dct` removed, and
+    `old_char` replaced with `new_char` in the keys, like `replace_in_keys()` does.
     """
 
     result_dct = dict()
@@ -136,15 +223,18 @@ def remove_common_dict_items(dct: Dict, reference_dct: Dict) -> Dict:
         reference_value = reference_dct[key]
 
         if isinstance(value, dict):
-            value = remove_common_dict_items(value, reference_value)
+            value = remove_common_dict_items_and_replace_in_keys(
+                value, reference_value, old_char=old_char, new_char=new_char
+            )
             # Remove empty dicts
             if not value:
                 continue
         else:
             if value == reference_value:
                 continue
+            value = replace_in_keys(value, old_char=old_char, new_char=new_char)
 
-        result_dct[key] = value
+        result_dct[key.replace(old_char, new_char)] = value
 
     return result_dct
 
@@ -1,5 +1,6 @@
 from dataclasses import fields
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional
 
 import marshmallow_dataclass
 from marshmallow.decorators import pre_load
@@ -8,6 +9,16 @@ from pygitguardian.models import FromDictMixin, ToDictMixin
 from ggshield.core.text_utils import display_warning
 
 
+@lru_cache(None)
+def _get_field_names(cls: type) -> FrozenSet[str]:
+    """
+    Returns the names of the fields of dataclass `cls`. Cached because
+    `filter_fields()` runs for every loaded item, including each element of ignore
+    lists.
+    """
+    return frozenset(field_.name for field_ in fields(cls))
+
+
 @marshmallow_dataclass.dataclass
 class FilteredConfig(FromDictMixin, ToDictMixin):
     @classmethod
@@ -16,7 +27,7 @@ class FilteredConfig(FromDictMixin, ToDictMixin):
         """
         Remove and alert on unknown fields.
         """
-        field_names = {field_.name for field_ in fields(cls)}
+        field_names = _get_field_names(cls)
         filtered_fields = {}
         for key, item in data.items():
             filtered_key = key.replace("-", "_")
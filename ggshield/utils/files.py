@@ -1,6 +1,7 @@
+import os
 import re
 from pathlib import Path, PurePosixPath
-from typing import List, Set, Union
+from typing import Iterator, List, Set, Union
 
 from ggshield.utils._binary_extensions import BINARY_EXTENSIONS
 from ggshield.utils.git_shell import get_filepaths_from_ref, git_ls, is_git_dir
@@ -56,15 +57,34 @@ def get_filepaths(
                     else git_ls(path)
                 )
                 _targets = {path / x for x in target_filepaths}
+                for file_path in _targets:
+                    if not is_path_excluded(file_path, exclusion_regexes):
+                        targets.add(file_path)
             else:
-                _targets = path.rglob(r"*")
-
-            for file_path in _targets:
-                if not is_path_excluded(file_path, exclusion_regexes):
-                    targets.add(file_path)
+                targets.update(_walk_not_excluded_files(path, exclusion_regexes))
     return targets
 
 
+def _walk_not_excluded_files(
+    path: Path, exclusion_regexes: Set[re.Pattern]
+) -> Iterator[Path]:
+    """
+    Yields the files inside `path`, recursively, skipping excluded ones.
+
+    Excluded directories are not traversed at all: this avoids listing the content of
+    large directories like `node_modules` only to exclude every file they contain.
+    """
+    for dirpath, dirnames, filenames in os.walk(path):
+        root = Path(dirpath)
+        dirnames[:] = [
+            x for x in dirnames if not is_path_excluded(root / x, exclusion_regexes)
+        ]
+        for filename in filenames:
+            file_path = root / filename
+            if not is_path_excluded(file_path, exclusion_regexes):
+                yield file_path
+
+
 def is_path_binary(path: Union[str, Path]) -> bool:
     ext = Path(path).suffix
     # `[1:]` because `ext` starts with a "." but extensions in `BINARY_EXTENSIONS` do not
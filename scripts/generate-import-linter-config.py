@@ -3,6 +3,7 @@ import argparse
 import configparser
 import importlib
 import pkgutil
+from functools import lru_cache
 from typing import Dict, ItemsView, List, Literal, Tuple, Union, cast
 
 from typing_extensions import NotRequired, TypedDict
@@ -71,16 +72,23 @@ STATIC_CONFIG = {
 }
 
 
-def get_submodules(*, name: str, prefixed: bool) -> List[str]:
-    """Retrieve the modules included in a package"""
+@lru_cache(None)
+def get_submodules(*, name: str, prefixed: bool) -> Tuple[str, ...]:
+    """
+    Retrieve the sorted modules included in a package.
+
+    Results are cached since the same packages appear in several contracts.
+    """
     module = importlib.import_module(name)
-    return [
-        x.name
-        for x in pkgutil.iter_modules(
-            path=module.__path__,
-            prefix=f"{module.__name__}." if prefixed else "",
+    return tuple(
+        sorted(
+            x.name
+            for x in pkgutil.iter_modules(
+                path=module.__path__,
+                prefix=f"{module.__name__}." if prefixed else "",
+            )
         )
-    ]
+    )
 
 
 def expand_glob(line: str) -> List[str]:
@@ -97,9 +105,9 @@ def expand_glob(line: str) -> List[str]:
     - "xxx" (no globs) => ["xxx"]
     """
     if line.endswith(".%"):
-        return sorted(get_submodules(name=line[:-2], prefixed=True))
+        return list(get_submodules(name=line[:-2], prefixed=True))
     if line.endswith("|%"):
-        return [" | ".join(sorted(get_submodules(name=line[:-2], prefixed=True)))]
+        return [" | ".join(get_submodules(name=line[:-2], prefixed=True))]
     if "{}" in line:
         name = line[: line.index(".{}")]
         return [
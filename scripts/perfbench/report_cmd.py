@@ -1,9 +1,11 @@
 import csv
+import io
 import logging
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from statistics import median, stdev
+from statistics import median
 from typing import Dict, Iterable, List, Optional, TextIO, Tuple
 
 import click
@@ -21,8 +23,12 @@ DEFAULT_MAX_DELTA_SECS = 3
 class ReportRow:
     command: str
     dataset: str
-    # Mapping of version => [durations]
-    durations_for_versions: Dict[str, List[float]] = field(default_factory=dict)
+    # [durations] for each version, in the order of RawReport.versions
+    durations_for_versions: List[List[float]]
+
+
+# Key used to sort report rows
+ROW_SORT_KEY = attrgetter("command", "dataset")
 
 
 @dataclass
@@ -42,20 +48,22 @@ def print_markdown_table(
     """
     assert len(headers) == len(alignments)
 
-    widths = [0] * len(headers)
-    for row in [headers, *rows]:
-        for idx, cell in enumerate(row):
-            width = len(cell)
-            widths[idx] = max(widths[idx], width)
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+
+    # Collect all the lines, then write them at once
+    lines: List[str] = []
+
+    # Build the row template once: each cell is padded using a format-spec alignment
+    # character matching `alignments`
+    row_format = (
+        "".join(
+            f"| {{:{'>' if a == 'R' else '<'}{w}}} " for a, w in zip(alignments, widths)
+        )
+        + "|\n"
+    )
 
     def print_row(row: Iterable[str]) -> None:
-        for cell, alignment, width in zip(row, alignments, widths):
-            if alignment == "R":
-                cell = cell.rjust(width)
-            else:
-                cell = cell.ljust(width)
-            out.write(f"| {cell} ")
-        out.write("|\n")
+        lines.append(row_format.format(*row))
 
     # print rows
     print_row(headers)
@@ -67,27 +75,30 @@ def print_markdown_table(
     for row in rows:
         print_row(row)
 
+    out.write("".join(lines))
 
-def create_duration_row(
-    sorted_versions: List[str], durations_for_versions: Dict[str, List[float]]
-) -> List[Duration]:
-    row: List[Duration] = []
-    for version in sorted_versions:
-        durations_for_version = durations_for_versions[version]
-        value = median(durations_for_version)
 
-        if len(durations_for_version) > 1:
-            deviation = stdev(durations_for_version)
-        else:
-            deviation = None
-        row.append(Duration(value, deviation))
+def create_duration(durations: List[float]) -> Duration:
+    """
+    Returns the median and the median absolute deviation (MAD) of `durations`.
+
+    With the few runs done for each version, the MAD is less sensitive to a single
+    outlier run than the standard deviation.
+    """
+    value = median(durations)
+    if len(durations) < 2:
+        return Duration(value, None)
 
-    return row
+    deviation = median(abs(x - value) for x in durations)
+    return Duration(value, deviation)
+
+
+def create_duration_row(durations_for_versions: List[List[float]]) -> List[Duration]:
+    return [create_duration(durations) for durations in durations_for_versions]
 
 
 def create_duration_cells(
-    sorted_versions: List[str],
-    durations_for_versions: Dict[str, List[float]],
+    durations_for_versions: List[List[float]],
     min_delta: float,
     max_delta: float,
 ) -> Tuple[List[str], bool]:
@@ -98,7 +109,7 @@ def create_duration_cells(
     reference: Optional[float] = None
     fail = False
 
-    durations = create_duration_row(sorted_versions, durations_for_versions)
+    durations = create_duration_row(durations_for_versions)
 
     for duration in durations:
         cell = f"{duration.value:.2f}s"
@@ -136,41 +147,41 @@ def create_header_row(sorted_versions: List[str]) -> List[str]:
 
 def print_csv_output(
     sorted_versions: List[str],
-    rows: Iterable[ReportRow],
+    sorted_rows: Iterable[ReportRow],
 ):
-    writer = csv.writer(sys.stdout)
+    # Format the whole CSV in memory, then write it at once
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
 
     # Header row
     headers = ["command", "dataset"]
     for version in sorted_versions:
-        headers.extend([version, f"{version} (deviation)"])
+        headers.extend([version, f"{version} (MAD)"])
     writer.writerow(headers)
 
     # Data
-    for row in sorted(rows, key=lambda x: (x.command, x.dataset)):
-        durations = create_duration_row(
-            sorted_versions,
-            row.durations_for_versions,
-        )
+    for row in sorted_rows:
+        durations = create_duration_row(row.durations_for_versions)
         table_row = [row.command, row.dataset]
         for duration in durations:
             table_row.append(str(duration.value))
             table_row.append(str(duration.deviation))
         writer.writerow(table_row)
 
+    sys.stdout.write(buffer.getvalue())
+
 
 def print_markdown_output(
     sorted_versions: List[str],
-    rows: Iterable[ReportRow],
+    sorted_rows: Iterable[ReportRow],
     min_delta: float,
     max_delta: float,
 ):
     # Create table rows
     table_rows = []
     has_failed = False
-    for row in sorted(rows, key=lambda x: (x.command, x.dataset)):
+    for row in sorted_rows:
         duration_cells, fail = create_duration_cells(
-            sorted_versions,
             row.durations_for_versions,
             min_delta,
             max_delta,
@@ -220,6 +231,9 @@ def report_cmd(
 ) -> None:
     """
     Generate a report from a benchmark run
+
+    Durations are the median of the runs, followed by their median absolute deviation
+    (MAD) when there are several runs.
     """
     report_path = get_raw_report_path(work_dir)
     if not report_path.exists():
@@ -234,17 +248,20 @@ def report_cmd(
     with report_path.open() as fp:
         raw_report = RawReport.load(fp)
 
+    sorted_versions = raw_report.versions
+    version_indices = {version: idx for idx, version in enumerate(sorted_versions)}
+
     for entry in raw_report.entries:
-        row = row_dict.setdefault(
-            (entry.command, entry.dataset),
-            ReportRow(entry.command, entry.dataset),
+        key = (entry.command, entry.dataset)
+        row = row_dict.get(key)
+        if row is None:
+            row = row_dict[key] = ReportRow(*key, [[] for _ in sorted_versions])
+        row.durations_for_versions[version_indices[entry.version]].append(
+            entry.duration
         )
-        durations = row.durations_for_versions.setdefault(entry.version, [])
-        durations.append(entry.duration)
-
-    sorted_versions = raw_report.versions
+    sorted_rows = sorted(row_dict.values(), key=ROW_SORT_KEY)
 
     if use_csv:
-        print_csv_output(sorted_versions, row_dict.values())
+        print_csv_output(sorted_versions, sorted_rows)
     else:
-        print_markdown_output(sorted_versions, row_dict.values(), min_delta, max_delta)
+        print_markdown_output(sorted_versions, sorted_rows, min_delta, max_delta)
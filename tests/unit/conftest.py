@@ -15,6 +15,7 @@ from pygitguardian.models import ScanResult
 from requests.utils import DEFAULT_CA_BUNDLE_PATH, extract_zipped_paths
 
 from ggshield.core.cache import Cache
+from ggshield.core.config.utils import clear_config_path_cache
 from ggshield.core.url_utils import dashboard_to_api_url
 from ggshield.utils.git_shell import (
     _get_git_path,
@@ -668,3 +669,4 @@ def clear_cache():
     _get_git_path.cache_clear()
     _git_rev_parse_absolute.cache_clear()
     read_git_file.cache_clear()
+    clear_config_path_cache()
@@ -39,7 +39,7 @@ class TestAuthConfig:
 
         config_data = config.auth_config.to_dict()
         config_data = prepare_auth_config_dict_for_save(config_data)
-        replace_in_keys(config_data, old_char="_", new_char="-")
+        config_data = replace_in_keys(config_data, old_char="_", new_char="-")
         assert config_data == TEST_AUTH_CONFIG
 
     @pytest.mark.parametrize("n", [0, 2])
@@ -1,7 +1,8 @@
 import contextlib
 import io
+import sys
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import pytest
 
@@ -13,7 +14,11 @@ from ggshield.core.config.user_config import (
     IaCConfigIgnoredPolicy,
     SCAConfig,
     SCAConfigIgnoredVulnerability,
+    SecretConfig,
     UserConfig,
+    is_ghsa_valid,
+    remove_expired_elements,
+    validate_policy_id,
 )
 from ggshield.core.errors import ParseError, UnexpectedError
 from ggshield.core.types import IgnoredMatch
@@ -31,8 +36,10 @@ class TestUserConfig:
     def test_parsing_error(cli_fs_runner, local_config_path):
         write_text(local_config_path, "Not a:\nyaml file.\n")
         expected_output = f"{local_config_path} is not a valid YAML file:"
-        with pytest.raises(ParseError, match=expected_output):
+        with pytest.raises(ParseError, match=expected_output) as exc_info:
             Config()
+        # The error location must point to the file
+        assert f'{local_config_path}", line' in str(exc_info.value)
 
     def test_display_options(self, local_config_path):
         write_yaml(local_config_path, {"verbose": True, "show_secrets": True})
@@ -152,6 +159,30 @@ class TestUserConfig:
         ]
         assert config.secret.ignored_paths == {"/foo", "/bar"}
 
+    @pytest.mark.parametrize(
+        "config_dict",
+        [
+            {"version": 2, "secret": {"ignored-detectors": ["my-detector"]}},
+            {"banlisted-detectors": ["my-detector"]},
+        ],
+        ids=["v2", "v1"],
+    )
+    def test_ignored_detectors_are_interned(self, config_dict: Dict[str, Any]):
+        """
+        GIVEN a config file ignoring a detector
+        WHEN loading it
+        THEN the detector name is interned
+        """
+        config_path = "config.yaml"
+        write_yaml(config_path, config_dict)
+
+        config, _ = UserConfig.load(config_path)
+
+        (detector,) = config.secret.ignored_detectors
+        # Intern another string object with the same value: if `detector` had not
+        # been interned, a different object would be returned
+        assert detector is sys.intern("".join(["my-", "detector"]))
+
     def test_load_ignored_matches_with_empty_names(self):
         config_path = "config.yaml"
         # Use write_text() here because write_yaml() cannot generate a key with a really
@@ -175,6 +206,35 @@ class TestUserConfig:
             IgnoredMatch(name="", match="dbca"),
         ]
 
+    def test_add_ignored_matches(self):
+        """
+        GIVEN a SecretConfig with ignored matches
+        WHEN adding matches, some of them already present
+        THEN only new matches are added, and unnamed existing matches get a name
+        """
+        config = SecretConfig(
+            ignored_matches=[
+                IgnoredMatch(name="", match="abcd"),
+                IgnoredMatch(name="named", match="efgh"),
+            ]
+        )
+        config.add_ignored_matches(
+            [
+                IgnoredMatch(name="new", match="abcd"),
+                IgnoredMatch(name="other", match="efgh"),
+                IgnoredMatch(name="", match="ijkl"),
+                IgnoredMatch(name="again", match="ijkl"),
+            ]
+        )
+        config.add_ignored_match(IgnoredMatch(name="", match="mnop"))
+
+        assert config.ignored_matches == [
+            IgnoredMatch(name="new", match="abcd"),
+            IgnoredMatch(name="named", match="efgh"),
+            IgnoredMatch(name="again", match="ijkl"),
+            IgnoredMatch(name="", match="mnop"),
+        ]
+
     @pytest.mark.parametrize(
         "paths",
         (
@@ -336,6 +396,29 @@ class TestUserConfig:
         assert isinstance(iac_config, IaCConfig)
         assert len(iac_config.ignored_paths) == 4
 
+    def test_iac_ignore_unquoted_dates(self, local_config_path):
+        """
+        GIVEN a local config file with unquoted until dates, which the YAML loader
+        turns into date instances
+        WHEN loading it
+        THEN the dates are parsed as midnight UTC
+        """
+        write_text(
+            local_config_path,
+            """
+            version: 2
+            iac:
+              ignored-paths:
+                - path: mypath1
+                  until: 2050-05-01
+                - path: mypath2
+                  until: 2050-5-1
+            """,
+        )
+        config, _ = UserConfig.load(local_config_path)
+        expected = datetime(2050, 5, 1).astimezone(timezone.utc)
+        assert [x.until for x in config.iac.ignored_paths] == [expected, expected]
+
     def test_iac_config_bad_policy_id(self, local_config_path):
         write_yaml(
             local_config_path,
@@ -579,3 +662,58 @@ class TestUserConfig:
         )
         config, _ = UserConfig.load(local_config_path)
         assert config.secret.ignore_known_secrets
+
+
+@pytest.mark.parametrize(
+    ("policy_id", "expected"),
+    [
+        ("GG_IAC_0001", True),
+        ("GG_IAC_001", False),
+        ("GG_IAC_00011", False),
+        ("GG_IAC_00a1", False),
+        ("gg_iac_0001", False),
+        ("GG_IAC_\u0661\u0662\u0663\u0664", False),  # non-ASCII digits
+    ],
+)
+def test_validate_policy_id(policy_id: str, expected: bool):
+    assert validate_policy_id(policy_id) == expected
+
+
+@pytest.mark.parametrize(
+    ("ghsa_id", "expected"),
+    [
+        ("GHSA-aaaa-bbbb-cccc", True),
+        ("GHSA-AA00-bb11-CC22", True),
+        ("GHSA-aaaa-bbbb-ccc", False),
+        ("GHSA-aaaa-bbbb-cccc-", False),
+        ("GHSA-aaaa--bbb-cccc", False),
+        ("GHSA-aa_a-bbbb-cccc", False),
+        ("ghsa-aaaa-bbbb-cccc", False),
+        ("GHSA-\u00e9aaa-bbbb-cccc", False),  # non-ASCII letters
+        ("ABCD-bbbb", False),
+    ],
+)
+def test_is_ghsa_valid(ghsa_id: str, expected: bool):
+    assert is_ghsa_valid(ghsa_id) == expected
+
+
+def test_remove_expired_elements():
+    """
+    GIVEN a list of ignored elements, some of them expired at a given time
+    WHEN calling remove_expired_elements() with this time
+    THEN expired elements are removed from the list and returned, in order
+    """
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    before = datetime(2029, 1, 1, tzinfo=timezone.utc)
+    after = datetime(2031, 1, 1, tzinfo=timezone.utc)
+    lst = [
+        IaCConfigIgnoredPath(path="p1", until=before),
+        IaCConfigIgnoredPath(path="p2"),
+        IaCConfigIgnoredPath(path="p3", until=now),
+        IaCConfigIgnoredPath(path="p4", until=after),
+    ]
+
+    expired = remove_expired_elements(lst, now=now)
+
+    assert [x.path for x in lst] == ["p2", "p4"]
+    assert [x.path for x in expired] == ["p1", "p3"]
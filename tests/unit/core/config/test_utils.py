@@ -2,11 +2,17 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+import marshmallow_dataclass
 import pytest
+from marshmallow import Schema
 
+from ggshield.core.config.user_config import UserConfig
 from ggshield.core.config.utils import (
+    LazySchema,
+    find_global_config_path,
     find_local_config_path,
-    remove_common_dict_items,
+    lazy_schema,
+    remove_common_dict_items_and_replace_in_keys,
     remove_url_trailing_slash,
     replace_in_keys,
     update_from_other_instance,
@@ -17,10 +23,27 @@ from tests.repository import Repository
 
 def test_replace_in_keys():
     data = {"last-found-secrets": {"XXX"}}
-    replace_in_keys(data, "-", "_")
-    assert data == {"last_found_secrets": {"XXX"}}
-    replace_in_keys(data, "_", "-")
-    assert data == {"last-found-secrets": {"XXX"}}
+    result = replace_in_keys(data, "-", "_")
+    assert result == {"last_found_secrets": {"XXX"}}
+    assert replace_in_keys(result, "_", "-") == {"last-found-secrets": {"XXX"}}
+
+
+def test_replace_in_keys_nested():
+    """
+    GIVEN a dict containing nested dicts and lists of dicts
+    WHEN replace_in_keys() is called on it
+    THEN keys are replaced at all levels and the input is left untouched
+    """
+    data = {
+        "a-b": {"c-d": [{"e-f": "g-h"}, "i-j"]},
+        "k": ["l-m"],
+    }
+    result = replace_in_keys(data, "-", "_")
+    assert result == {
+        "a_b": {"c_d": [{"e_f": "g-h"}, "i-j"]},
+        "k": ["l-m"],
+    }
+    assert "a-b" in data
 
 
 @dataclass
@@ -109,10 +132,38 @@ def test_update_from_other_instance():
 def test_remove_common_dict_items(
     src: Dict[str, Any], reference: Dict[str, Any], expected: Dict[str, Any]
 ):
-    result = remove_common_dict_items(src, reference)
+    result = remove_common_dict_items_and_replace_in_keys(src, reference, "_", "-")
     assert result == expected
 
 
+def test_remove_common_dict_items_and_replace_in_keys():
+    """
+    GIVEN a dict with nested dicts and lists of dicts, and a reference dict
+    WHEN remove_common_dict_items_and_replace_in_keys() is called
+    THEN common items are removed and keys are renamed at all levels
+    """
+    src = {
+        "same_value": 1,
+        "new_value": 2,
+        "outer_dict": {"same_inner": "a", "new_inner": "b"},
+        "same_dict": {"inner_key": "c"},
+        "a_list": [{"some_key": "d"}],
+    }
+    reference = {
+        "same_value": 1,
+        "new_value": 1,
+        "outer_dict": {"same_inner": "a", "new_inner": "a"},
+        "same_dict": {"inner_key": "c"},
+        "a_list": [],
+    }
+    result = remove_common_dict_items_and_replace_in_keys(src, reference, "_", "-")
+    assert result == {
+        "new-value": 2,
+        "outer-dict": {"new-inner": "b"},
+        "a-list": [{"some-key": "d"}],
+    }
+
+
 def test_remove_url_trailing_slash():
     result = remove_url_trailing_slash("https://dashboard.gitguardian.com/")
     assert result == "https://dashboard.gitguardian.com"
@@ -134,3 +185,38 @@ def test_find_config_in_root(tmp_path: Path):
 
     with cd(str(dir_path)):
         assert find_local_config_path() == config_path
+
+
+def test_lazy_schema():
+    """
+    GIVEN a dataclass using lazy_schema()
+    WHEN accessing its SCHEMA attribute
+    THEN a schema honoring the lazy_schema() arguments is created, only once
+    """
+
+    @marshmallow_dataclass.dataclass
+    class LazyConfig:
+        name: str = ""
+        hidden: str = ""
+
+    LazyConfig.SCHEMA = lazy_schema(exclude=("hidden",))
+    assert isinstance(LazyConfig.__dict__["SCHEMA"], LazySchema)
+
+    schema = LazyConfig.SCHEMA
+    assert isinstance(schema, Schema)
+    assert LazyConfig.SCHEMA is schema
+    assert schema.dump(LazyConfig(name="n", hidden="h")) == {"name": "n"}
+
+
+def test_find_global_config_path_after_save(isolated_fs):
+    """
+    GIVEN no global config file, and find_global_config_path() already called
+    WHEN a global config file is created with UserConfig.save()
+    THEN find_global_config_path() returns it
+    """
+    assert find_global_config_path() is None
+
+    config_path = find_global_config_path(to_write=True)
+    UserConfig().save(config_path)
+
+    assert find_global_config_path() == config_path
@@ -7,8 +7,10 @@ from typing import Set, Union
 
 import pytest
 
+from ggshield.core.filter import init_exclusion_regexes
 from ggshield.core.tar_utils import get_empty_tar
-from ggshield.utils.files import is_path_excluded
+from ggshield.utils import files
+from ggshield.utils.files import get_filepaths, is_path_excluded
 
 
 def test_get_empty_tar():
@@ -38,3 +40,36 @@ def test_is_path_excluded(
 ) -> None:
     regexes = {re.compile(x) for x in regexes}
     assert is_path_excluded(path, regexes) == excluded
+
+
+def test_get_filepaths_does_not_walk_excluded_dirs(tmp_path: Path, monkeypatch):
+    """
+    GIVEN a directory, which is not a git repository, containing an excluded directory
+    WHEN listing its files
+    THEN files inside the excluded directory are not even looked at
+    AND the other files are returned
+    """
+    for name in ("a.txt", "src/b.py", "build/c.txt", "build/sub/d.txt"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    checked_paths = []
+
+    def spy_is_path_excluded(path, exclusion_regexes):
+        checked_paths.append(path)
+        return is_path_excluded(path, exclusion_regexes)
+
+    monkeypatch.setattr(files, "is_path_excluded", spy_is_path_excluded)
+
+    filepaths = get_filepaths(
+        [tmp_path],
+        init_exclusion_regexes(["build/"]),
+        recursive=True,
+        ignore_git=True,
+    )
+
+    assert filepaths == {tmp_path / "a.txt", tmp_path / "src" / "b.py"}
+    build_dir = tmp_path / "build"
+    assert build_dir in checked_paths
+    assert not any(build_dir in x.parents for x in checked_paths)
@@ -6,6 +6,7 @@ import pytest
 from pygitguardian import GGClient
 
 from ggshield.core.scan.file import get_files_from_paths
+from ggshield.utils.files import is_path_excluded
 from ggshield.verticals.sca.file_selection import (
     SCA_EXCLUSION_REGEXES,
     get_all_files_from_sca_paths,
@@ -34,9 +35,10 @@ def test_get_all_files_from_sca_paths(tmp_path):
     WHEN calling get_all_files_from_sca_paths
     THEN we get the ones that are not excluded by is_excluded_from_sca in the right order
     """
-    tmp_paths = [str(tmp_path / filename) for filename in FILE_NAMES]
-    for path in tmp_paths:
-        write_text(filename=path, content="")
+    for filename in FILE_NAMES:
+        path = tmp_path / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
 
     files = get_all_files_from_sca_paths(tmp_path, set(), True)
     assert len(files) == 7
@@ -88,6 +90,26 @@ def test_get_ignored_files(tmp_path, capsysbinary, file_path, expected):
     assert (captured.err != bytes("", "utf-8")) is expected
 
 
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    (
+        ("Pipfile", False),
+        ("foo/.venv/Pipfile", True),
+        (".venvsomething/Pipfile", False),
+        ("front/node_modules/pkg/package.json", True),
+        (".gitlab/ci/pyproject.toml", False),
+        (".git/config", True),
+    ),
+)
+def test_sca_exclusion_regexes(path: str, expected: bool):
+    """
+    GIVEN a file path
+    WHEN checking it against SCA_EXCLUSION_REGEXES
+    THEN only paths inside ignored directories are excluded
+    """
+    assert is_path_excluded(path, SCA_EXCLUSION_REGEXES) is expected
+
+
 @pytest.mark.parametrize(
     ("branch_name", "expected_files"),
     (